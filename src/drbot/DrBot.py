@@ -2,8 +2,9 @@ from __future__ import annotations
 import logging
 import schedule
 import time
+from pytimeparse import parse
 from .util import do_once
-from .log import log
+from .log import log, stop_log_listener
 from .storage import DataStore
 from .settings import SettingsManager, settings
 from .Botling import Botling
@@ -135,6 +136,7 @@ class DrBot:
         except Exception as e:
             log.critical(e)
             raise e
+        stop_log_listener()  # Write out any queued logs before the handlers get closed
         logging.shutdown()
 
     def _main(self) -> None:
@@ -148,19 +150,31 @@ class DrBot:
                 regi.setup()
 
         # Regularly poll all streams
+        # We back off exponentially while nothing is happening (to save API calls) and return to the fastest rate as soon as something happens
+        min_interval = parse(settings.polling.min_interval)
+        max_interval = parse(settings.polling.max_interval)
+        empty_polls = 0
+
         def poll_streams():
+            nonlocal empty_polls
             log.debug("Polling all streams.")
+            got_items = False
             for stream in self.streams:
                 if stream.is_active:
                     try:
-                        stream.run()
+                        got_items = stream.run() or got_items
                     except Exception as e:
                         try:
                             raise RuntimeError(f"{stream} crashed during polling.") from e
                         except:
                             stream.die()
                     self.reschedule_botlings([observer for observer in stream.observers if isinstance(observer, Botling)])  # If Botlings do any scheduling during their Stream handlers, we don't want to miss polling their sub-schedulers
-        poll_job = schedule.every(10).seconds.do(poll_streams)  # TBD generalize polling intervals (vary by stream?)
+            empty_polls = 0 if got_items else empty_polls + 1
+            interval = min(min_interval * 2 ** min(empty_polls, 32), max_interval)  # Cap the exponent so it doesn't grow forever
+            if interval != poll_job.interval:
+                log.debug(f"Changing the polling interval to {interval} seconds.")
+                poll_job.interval = interval  # Takes effect when the job reschedules itself after this run
+        poll_job = schedule.every(min_interval).seconds.do(poll_streams)  # TBD vary polling intervals by stream?
 
         # Initialize all sub-schedulers
         self.reschedule_botlings()
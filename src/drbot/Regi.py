@@ -13,6 +13,8 @@ class Regi(ABC):
     particularly dealing with registration with DrBot and graceful error handling.
     The name is short for "Registerable"."""
 
+    __slots__ = ("__kind", "__name", "__is_alive", "__is_registered", "json_encoder", "json_decoder", "__DrBotRep")
+
     __names: dict[str, set[str]] = {}
 
     # If you want your Regi to have settings, override this property and define its default settings.
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import abstractmethod
 from typing import Generic, TypeVar
+from functools import partial
 from .log import log
 from .Regi import Regi
 
@@ -22,13 +23,18 @@ class ObserverBundle(Generic[T]):
 
     def __str__(self) -> str:
         """A human-readable name for the observer (including the Botling name and the function names)."""
-        def get_name(func: Callable[..., Any]): return getattr(func, "__name__", getattr(func, "__qualname__", repr(func)))  # Handle lambdas and such
+        def get_name(func: Callable[..., Any]):
+            if isinstance(func, partial):
+                func = func.func  # Name partials after the function they wrap
+            return getattr(func, "__name__", getattr(func, "__qualname__", repr(func)))  # Handle lambdas and such
         return f'Observer "{self.observer.name}" (handler: {get_name(self.handler)}' + (f", start_run: {get_name(self.start_run)}" if self.start_run else "") + ")"
 
 
 class Stream(Regi, Generic[T]):
     """Scans incoming entries of type T and notifies observers about them."""
 
+    __slots__ = ("__observers",)
+
     def __init__(self, name: str | None = None) -> None:
         super().__init__("Stream", name)
         self.__observers: list[ObserverBundle[T]] = []
@@ -61,9 +67,7 @@ class Stream(Regi, Generic[T]):
 
         # Initialize last_processed
         if "last_processed" not in self.DR.storage:
-            latest = self.get_latest_item()
-            self.DR.storage["last_processed"] = None if latest is None else self.id(latest)
-            log.debug(f"Initialized last_processed for {self} - {self.DR.storage['last_processed']}")
+            self.initialize_storage(self.get_latest_item())
 
     def subscribe(self, observer: Regi, handler: Callable[[T], None], start_run: Callable[[], None] | None = None) -> ObserverBundle[T] | None:
         """Subscribe an observer with the stream.
@@ -93,9 +97,10 @@ class Stream(Regi, Generic[T]):
     def observers(self) -> list[Regi]:
         return list(bundle.observer for bundle in self.__observers)
 
-    def run(self) -> None:
+    def run(self) -> bool:
         """Poll the stream. Looks for new items and notifies observers.
-        Handles killing and unsubscribing any observers that error."""
+        Handles killing and unsubscribing any observers that error.
+        Returns whether there were any new items."""
 
         if not self.is_alive:
             raise RuntimeError(f"Tried to run() a dead {self}.")
@@ -110,7 +115,7 @@ class Stream(Regi, Generic[T]):
         while item is not None and self.skip_item(item):
             item = next(iter_items, None)
         if item is None:
-            return
+            return False
         log.info(f"{self} processing new items.")
 
         # Let all the handlers know we're starting a new run
@@ -132,7 +137,8 @@ class Stream(Regi, Generic[T]):
         count = 0
         while item is not None:
             count += 1
-            log.debug(f"{self} handling item {self.id(item)}")
+            item_id = self.id(item)  # IDs can be costly to compute (e.g. PRAW builds fullnames on every access), so do it once per item
+            log.debug(f"{self} handling item {item_id}")
             for i in reversed(range(len(self.__observers))):  # Reversed iteration since we may remove some items
                 bundle = self.__observers[i]
                 if not bundle.observer.is_alive:
@@ -144,7 +150,7 @@ class Stream(Regi, Generic[T]):
                     log.exception(f"{bundle} of {self} crashed during handler.")
                     bundle.observer.die(do_log=False)
                     del self.__observers[i]
-            self.DR.storage["last_processed"] = self.id(item)
+            self.DR.storage["last_processed"] = item_id
             item = next(iter_items, None)
 
         log.info(f"{self} processed {count} items.")
@@ -153,6 +159,7 @@ class Stream(Regi, Generic[T]):
         # even if bad things happen before the next scheduled save.
         log.debug(f"Triggering a save because {self} finished processing new items.")
         self.DR.storage.force_save()
+        return True
 
     @abstractmethod
     def get_items(self) -> Iterable[T]:
@@ -172,6 +179,12 @@ class Stream(Regi, Generic[T]):
         It's OK to return an item that would be skipped by skip_item(), so long as it's one that will be returned by your get_items()."""
         pass
 
+    def initialize_storage(self, latest: T | None) -> None:
+        """Called once on the first registration with the result of get_latest_item() to initialize the stream's storage.
+        If you need to initialize more things from the latest item, you can extend this so it only gets fetched once."""
+        self.DR.storage["last_processed"] = None if latest is None else self.id(latest)
+        log.debug(f"Initialized last_processed for {self} - {self.DR.storage['last_processed']}")
+
     def skip_item(self, item: T) -> bool:
         """Optionally, you can override this to skip cetain items.
         mostly useful to avoid updating last_processed with your own modlog entries,
@@ -90,6 +90,9 @@ class SidebarSyncer(Botling):
         if self.DR.settings.prefix != "":
             bar.append(self.DR.settings.prefix)
 
+        # reddit.sub is cached, so make sure we're not looking at old widgets
+        reddit.sub.widgets.refresh()
+
         # ID card
         bar.append(f"#### {self.DR.global_settings.subreddit}\n\n{reddit.sub.widgets.id_card.description}")  # TBD: special styling
 
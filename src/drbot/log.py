@@ -1,7 +1,11 @@
 from __future__ import annotations
 from typing import Any, Mapping
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import inspect
+import threading
 import praw
 import sys
 from .settings import settings
@@ -11,7 +15,8 @@ BASE_FORMAT = "[%(asctime)s] [%(filename)s/%(funcName)s:%(lineno)d] | %(reginame
 
 
 class LogFormatter(logging.Formatter):
-    """Logging formatter supporting colorized output and Regi name detection."""
+    """Logging formatter supporting colorized output and Regi name detection.
+    Pass use_color=False to leave out the color codes (e.g. when the output isn't a terminal)."""
 
     COLOR_CODES = {
         logging.CRITICAL: "\033[1;35m",  # bright/bold magenta
@@ -23,55 +28,134 @@ class LogFormatter(logging.Formatter):
 
     RESET_CODE = "\033[0m"
 
-    def __init__(self, fmt: str = "[%(asctime)s] [%(threadName)s] %(levelname)-8s | %(message)s", *args: Any, **kwargs: Any):
+    def __init__(self, fmt: str = "[%(asctime)s] [%(threadName)s] %(levelname)-8s | %(message)s", *args: Any, use_color: bool = True, **kwargs: Any):
         super().__init__(fmt=f"%(color_on)s{fmt}%(color_off)s", *args, **kwargs)
+        if not use_color:
+            self.COLOR_CODES = {}
+        # A tuple indexed directly by level number is faster to look up than the dict
+        self.__colors = tuple(self.COLOR_CODES.get(level, "") for level in range(max(self.COLOR_CODES, default=-1) + 1))
 
     def format(self, record: logging.LogRecord, detect_regi: bool = True, *args: Any, **kwargs: Any):
         # Colors
-        if (record.levelno in self.COLOR_CODES):
-            record.color_on = self.COLOR_CODES[record.levelno]
-            record.color_off = self.RESET_CODE
-        else:
-            record.color_on = ""
-            record.color_off = ""
-
-        record.regiclass = "N/A"
-        record.reginame = "-"
+        levelno = record.levelno
+        color = self.__colors[levelno] if 0 <= levelno < len(self.__colors) else ""  # Custom levels may fall outside the tuple
+        record.color_on = color
+        record.color_off = self.RESET_CODE if color else ""
 
         # Regi detection
-        if detect_regi:
-            from .Regi import Regi  # Lazy import to avoid circular dependency
-            for frame_record in inspect.stack():
-                self_obj = frame_record.frame.f_locals.get('self')
-                if isinstance(self_obj, Regi):
-                    record.regiclass = self_obj.__class__.__name__
-                    record.reginame = self_obj.name
-                    break
+        # This usually already happened in RegiFilter, since by the time a record gets here we're on the log listener's thread and the stack is no use
+        if not hasattr(record, "reginame"):
+            if detect_regi:
+                detect_regi_in_stack(record)
+            else:
+                record.regiclass = "N/A"
+                record.reginame = "-"
 
         return super().format(record, *args, **kwargs)
 
 
+def detect_regi_in_stack(record: logging.LogRecord) -> None:
+    """Find the Regi (if any) whose code emitted a log record, and note it on the record as reginame and regiclass.
+    This inspects the current stack, so it must be called on the thread that made the log call."""
+    from .Regi import Regi  # Lazy import to avoid circular dependency
+    record.regiclass = "N/A"
+    record.reginame = "-"
+    for frame_record in inspect.stack():
+        self_obj = frame_record.frame.f_locals.get('self')
+        if isinstance(self_obj, Regi):
+            record.regiclass = self_obj.__class__.__name__
+            record.reginame = self_obj.name
+            break
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """A file handler that lets log lines pile up in a large write buffer instead of flushing after every record.
+    Records at FLUSH_LEVEL or above are flushed right away, and a background thread flushes everything else every FLUSH_INTERVAL seconds."""
+
+    BUFFER_SIZE = 64 * 1024
+    FLUSH_LEVEL = logging.ERROR
+    FLUSH_INTERVAL = 30  # seconds
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.__closed = threading.Event()
+        threading.Thread(target=self.__flush_periodically, name="BufferedFileHandler flusher", daemon=True).start()
+
+    def __flush_periodically(self) -> None:
+        """Flush on a timer, so buffered lines get written even while nothing new is being logged."""
+        while not self.__closed.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def _open(self):
+        return self._builtin_open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            super().emit(record)  # Let FileHandler deal with (re)opening the file
+            return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.FLUSH_LEVEL:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.__closed.set()
+        super().close()
+
+
+class RegiFilter(logging.Filter):
+    """A logging filter that does Regi detection for each record on the thread that logged it.
+    Doesn't actually filter anything out."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        detect_regi_in_stack(record)
+        return True
+
+
 # Setup logger
 log = logging.getLogger(__name__)
-log.setLevel(logging.DEBUG)
+log.setLevel(logging.DEBUG)  # Raised to the lowest level any handler needs once they're set up
+log.addFilter(RegiFilter())
+
+# Writing logs is slow, so we only put them on a queue here and a background thread does the actual writing
+log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+log.addHandler(QueueHandler(log_queue))
 
 # Logging to console
 console_handler = logging.StreamHandler()
-console_handler.setFormatter(LogFormatter(fmt=BASE_FORMAT))
+console_handler.setFormatter(LogFormatter(fmt=BASE_FORMAT, use_color=console_handler.stream.isatty()))  # No point in color codes if we're being piped somewhere
 console_handler.setLevel(settings.logging.console_log_level)
-log.addHandler(console_handler)
+log_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+log_listener.start()
+
+
+def stop_log_listener() -> None:
+    """Stop the background logging thread, making sure everything still in the queue gets written first.
+    Called automatically on exit."""
+    atexit.unregister(stop_log_listener)  # So it doesn't get stopped twice
+    log_listener.stop()
+
+
+atexit.register(stop_log_listener)
 
 # Logging to file
 if settings.logging.log_path != "":
     try:
-        logfile_handler = logging.FileHandler(settings.logging.log_path)
+        logfile_handler = BufferedFileHandler(settings.logging.log_path)
     except Exception as e:
         log.critical(f"Couldn't open the log file: {settings.logging.log_path}")
         log.critical(e)
         raise e
-    logfile_handler.setFormatter(LogFormatter(fmt=BASE_FORMAT))
+    logfile_handler.setFormatter(LogFormatter(fmt=BASE_FORMAT, use_color=False))
     logfile_handler.setLevel(settings.logging.file_log_level)
-    log.addHandler(logfile_handler)
+    log_listener.handlers += (logfile_handler,)
+
+# Drop records no handler wants before they're even created, so that disabled levels cost (almost) nothing
+log.setLevel(min(handler.level for handler in log_listener.handlers))
 
 
 def smart_error(*args: Any, **kwargs: Any) -> None:
@@ -1,15 +1,17 @@
 from __future__ import annotations
 import logging
 import random
-from typing import Any
+from functools import cached_property
+from typing import Any, Callable
 from uuid import uuid4
 import praw
 import prawcore
+from prawcore.exceptions import Forbidden, NotFound, ResponseException
 from drbot import __version__
 from requests.status_codes import codes
 from .log import BASE_FORMAT, ModmailLoggingHandler, TemplateLoggingFormatter, log
 from .settings import settings
-from .util import Singleton
+from .util import Singleton, TTLCache
 
 
 class InfiniteRetryStrategy(prawcore.sessions.RetryStrategy):
@@ -48,28 +50,58 @@ class DrReddit(praw.Reddit, Singleton):
     """A singleton that handles all of DrBot's communication with Reddit.
     Everything passes through here so that safeguards, rate limits, and dry run mode function globally."""
 
+    RATELIMIT_SECONDS = 15 * 60  # The longest rate limit wait we're willing to sit through
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         if self._initialized:
             return
+        # When reddit tells us to "take a break for N minutes", have PRAW wait that long and retry
+        # instead of raising (which would kill whichever Botling made the request)
+        kwargs.setdefault("ratelimit_seconds", self.RATELIMIT_SECONDS)
         super().__init__(*args, **kwargs)
         self._core._retry_strategy_class = InfiniteRetryStrategy
         self.DR = self._DrRedditHelper(self)
 
-    @property
-    def sub(self) -> praw.reddit.models.SubredditHelper:
+    @cached_property
+    def sub(self) -> praw.reddit.models.Subreddit:
+        """The subreddit DrBot runs on.
+        This is the same object every time, so anything PRAW lazily fetches on it (e.g. widgets) stays cached until you refresh it."""
         return self.subreddit(settings.subreddit)
 
     class _DrRedditHelper():
         """A helper that contains a bunch of convenient reddit functions for use by Botlings and other DrBot components."""
 
+        # Maps a fullname's type prefix to how we fetch it
+        _THING_GETTERS: dict[str, Callable[[DrReddit, str], Any]] = {
+            "t1_": lambda reddit, fullname: reddit.comment(fullname),
+            "t3_": lambda reddit, fullname: reddit.submission(fullname[3:]),  # PRAW requires us to chop off the "t3_"
+        }
+
+        MOD_CACHE_TTL = 5 * 60  # seconds - mod lists rarely change, so there's no need to ask reddit every time
+        USER_CACHE_TTL = 5 * 60  # seconds
+        MAX_MODMAIL_LENGTH = 10000  # Reddit's limit on modmail bodies
+        TRUNCATION_TRAILER = "... [truncated]"
+        MODMAIL_SUBJECT_PREFIX = "DrBot: "
+        MODMAIL_TRAILER = "\n\n(This is an automated message by [DrBot](https://github.com/c0d3rman/DrBot).)"
+
         def __init__(self, reddit: DrReddit):
             self._reddit = reddit
+            self.__mod_cache: TTLCache[str, bool] = TTLCache(self.MOD_CACHE_TTL)
+            self.__user_cache: TTLCache[str, bool] = TTLCache(self.USER_CACHE_TTL)
 
         def user_exists(self, username: str) -> bool:
-            """Check if a user exists on reddit."""
+            """Check if a user exists on reddit.
+            Results are cached for a few minutes, since checking costs a request per user."""
+            key = username.lower()  # Usernames are case-insensitive
+            result = self.__user_cache.get(key)
+            if result is None:
+                result = self.__user_cache[key] = self.__user_exists(username)
+            return result
+
+        def __user_exists(self, username: str) -> bool:
             try:
                 self._reddit.redditor(username).fullname
-            except prawcore.exceptions.NotFound:
+            except NotFound:
                 return False  # Account deleted
             except AttributeError:
                 return False  # Account suspended
@@ -81,17 +113,15 @@ class DrReddit(praw.Reddit, Singleton):
             try:
                 self._reddit.sub.wiki[page].may_revise
                 return True
-            except prawcore.exceptions.NotFound:
+            except NotFound:
                 return False
 
         def get_thing(self, fullname: str) -> praw.reddit.models.Comment | praw.reddit.models.Submission:
             """For getting a comment or submission from a fullname when you don't know which one it is."""
-            if fullname.startswith("t1_"):
-                return self._reddit.comment(fullname)
-            elif fullname.startswith("t3_"):
-                return self._reddit.submission(fullname[3:])  # PRAW requires us to chop off the "t3_"
-            else:
+            getter = self._THING_GETTERS.get(fullname[:3])
+            if getter is None:
                 raise ValueError(f"Unknown fullname type: {fullname}")
+            return getter(self._reddit, fullname)
 
         def is_muted(self, username: str | praw.reddit.models.Redditor | None) -> bool:
             """Check if a user is muted in your sub."""
@@ -114,41 +144,36 @@ class DrReddit(praw.Reddit, Singleton):
                     username = f"[invalid user]"
                 else:
                     username = f"u/{username}"
-                log.warning(f'Modlog "{subject}" not sent to {username} because they are muted.')
+                log.warning('Modlog "%s" not sent to %s because they are muted.', subject, username)
                 return
 
             # Add common elements
             if add_common:
-                subject = "DrBot: " + subject
-                body += "\n\n(This is an automated message by [DrBot](https://github.com/c0d3rman/DrBot).)"
+                subject = self.MODMAIL_SUBJECT_PREFIX + subject
+                body += self.MODMAIL_TRAILER
 
             # Hide username by default in modmails to users
             if recipient is not None and 'author_hidden' not in kwargs:
                 kwargs['author_hidden'] = True
 
             # Truncate if necessary
-            if len(body) > 10000:
-                log.warning(f'Modlog "{subject}" over maximum length, truncating.')
-                trailer = "... [truncated]"
-                body = body[:10000 - len(trailer)] + trailer
+            if len(body) > self.MAX_MODMAIL_LENGTH:
+                log.warning('Modlog "%s" over maximum length, truncating.', subject)
+                body = body[:self.MAX_MODMAIL_LENGTH - len(self.TRUNCATION_TRAILER)] + self.TRUNCATION_TRAILER
 
-            log.info(f'Sending modmail {"as mod discussion " if recipient is None else f"to u/{recipient} "}with subject "{subject}"')
+            log.info('Sending modmail %s with subject "%s"', "as mod discussion" if recipient is None else f"to u/{recipient}", subject)
 
+            # These logs include the whole body, so we let logging fill them in only if they'll actually be written
+            recipient_name = "mod discussion" if recipient is None else f"u/{recipient}"
             if settings.dry_run:
-                log.info(f"""DRY RUN: would have sent the following modmail:
-Recipient: {"mod discussion" if recipient is None else f"u/{recipient}"}
-Subject: "{subject}"
-{body}""")
+                log.info('DRY RUN: would have sent the following modmail:\nRecipient: %s\nSubject: "%s"\n%s', recipient_name, subject, body)
 
                 # Create a fake modmail to return so as to not break callers that need one in dry run mode
                 def fake_modmail(): return None
                 fake_modmail.id = f"fakeid_{uuid4().hex}"
                 return fake_modmail
             else:
-                log.debug(f"""Sending modmail:
-Recipient: {"mod discussion" if recipient is None else f"u/{recipient}"}
-Subject: "{subject}"
-{body}""")
+                log.debug('Sending modmail:\nRecipient: %s\nSubject: "%s"\n%s', recipient_name, subject, body)
 
                 modmail = self._reddit.sub.modmail.create(subject=subject, body=body, recipient=recipient, **kwargs)
                 if archive:
@@ -156,27 +181,34 @@ Subject: "{subject}"
                 return modmail
 
         def is_mod(self, username: str | praw.reddit.models.Redditor | None) -> bool:
-            """Check if a user is a mod in your sub."""
+            """Check if a user is a mod in your sub.
+            Results are cached for a few minutes."""
             if username is None:
                 return False
             if isinstance(username, praw.reddit.models.Redditor):
                 username = username.name
-            return len(self._reddit.sub.moderator(username)) > 0
+            key = username.lower()  # Usernames are case-insensitive
+            result = self.__mod_cache.get(key)
+            if result is None:
+                result = self.__mod_cache[key] = len(self._reddit.sub.moderator(redditor=username)) > 0  # Reddit filters the list for us, so this is at most one entry
+            return result
 
 
 # Log in to reddit and initialize the singleton
-if settings.reddit_auth._refresh_token != "":
-    log.debug(f"Logging in to reddit using refresh token... (client id '{settings.reddit_auth.drbot_client_id}')")
-    reddit = DrReddit(client_id=settings.reddit_auth.drbot_client_id,
+auth = settings.reddit_auth
+client_id = auth.drbot_client_id.strip()  # A stray newline here would make every login attempt fail (and retry forever)
+if auth._refresh_token != "":
+    log.debug(f"Logging in to reddit using refresh token... (client id '{client_id}')")
+    reddit = DrReddit(client_id=client_id,
                       client_secret=None,
-                      refresh_token=settings.reddit_auth._refresh_token,
+                      refresh_token=auth._refresh_token,
                       user_agent=f"DrBot v{__version__}")
-elif settings.reddit_auth.manual._username != "":
-    log.debug(f"Logging in to reddit using username + password + client_secret... (client id '{settings.reddit_auth.drbot_client_id}')")
-    reddit = DrReddit(client_id=settings.reddit_auth.drbot_client_id,
-                      client_secret=settings.reddit_auth.manual._client_secret,
-                      username=settings.reddit_auth.manual._username,
-                      password=settings.reddit_auth.manual._password,
+elif auth.manual._username != "":
+    log.debug(f"Logging in to reddit using username + password + client_secret... (client id '{client_id}')")
+    reddit = DrReddit(client_id=client_id,
+                      client_secret=auth.manual._client_secret,
+                      username=auth.manual._username,
+                      password=auth.manual._password,
                       user_agent=f"DrBot v{__version__}")
 else:
     e = RuntimeError("You need to set a login method in settings/secrets.toml!")
@@ -185,23 +217,24 @@ else:
 
 # Make sure we're logged in
 try:
-    assert reddit.user.me() is not None
-except (prawcore.exceptions.ResponseException, AssertionError) as e:
+    me = reddit.user.me()
+    assert me is not None
+except (ResponseException, AssertionError) as e:
     log.critical("Failed to log in to reddit. Are your login details correct?")
     raise RuntimeError("Failed to log in to reddit. Are your login details correct?") from None
 
-log.info(f"Logged in to reddit as u/{reddit.user.me().name}")
+log.info(f"Logged in to reddit as u/{me.name}")
 
 try:
-    if not reddit.subreddit(settings.subreddit).user_is_moderator:
-        e = RuntimeError(f"u/{reddit.user.me().name} is not a mod in r/{settings.subreddit}")
+    if not reddit.sub.user_is_moderator:  # This fetches the sub's about page onto the shared reddit.sub, so nothing else has to
+        e = RuntimeError(f"u/{me.name} is not a mod in r/{settings.subreddit}")
         log.critical(e)
         raise e
-except prawcore.exceptions.Forbidden:
+except Forbidden:
     e = RuntimeError(f"r/{settings.subreddit} is private or quarantined.")
     log.critical(e)
     raise e
-except prawcore.exceptions.NotFound:
+except NotFound:
     e = RuntimeError(f"r/{settings.subreddit} is banned.")
     log.critical(e)
     raise e
@@ -220,3 +253,4 @@ DrBot is still running. Check the log for more details.""",
 {log}"""}))
     modmail_handler.setLevel(logging.ERROR)
     log.addHandler(modmail_handler)
+    log.setLevel(min(log.level, modmail_handler.level))  # Make sure the logger lets errors through even if the other handlers are quieter
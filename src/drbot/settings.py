@@ -5,9 +5,10 @@ import copy
 import json
 import tomlkit
 from tomlkit.items import Item
-from dynaconf import Validator, LazySettings
+from dynaconf import Validator, LazySettings, ValidationError
 from dynaconf.validator import OrValidator
-from .util import Singleton
+from pytimeparse import parse
+from .util import Singleton, validate_duration
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -19,16 +20,18 @@ class DotDict(dict[Any, Any]):
     Also handles unwrapping of tomlkit items."""
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__()
-        for dict_arg in args:
-            for k, v in dict_arg.items():
-                if isinstance(v, dict) and not isinstance(v, DotDict):
-                    v = DotDict(v)
-                super().__setitem__(k, v)
-        for k, v in kwargs.items():
+        # Build everything up in a plain dict first so we can fill ourselves in one go,
+        # rather than going around our read-only __setitem__ one key at a time
+        merged: dict[Any, Any] = {}
+        for dict_arg in (*args, kwargs):
+            merged.update(dict_arg)
+        for k, v in merged.items():
+            # Unwrap tomlkit items once here rather than on every access, since they sometimes cause issues when passed to PRAW
+            if isinstance(v, Item):
+                v = merged[k] = v.unwrap()
             if isinstance(v, dict) and not isinstance(v, DotDict):
-                v = DotDict(v)
-            super().__setitem__(k, v)
+                merged[k] = DotDict(v)
+        super().__init__(merged)
 
     def __setitem__(self, key: Any, value: Any) -> None:
         raise AttributeError(f"This dictionary is read only. You cannot edit the key '{key}'.")
@@ -37,9 +40,6 @@ class DotDict(dict[Any, Any]):
         raise AttributeError(f"This dictionary is read only. You cannot edit the key '{key}'.")
 
     def __getattr__(self, key: Any) -> Any:
-        # Unwrap tomlkit items, since they sometimes cause issues when passed to PRAW
-        if isinstance(self.__getitem__(key), Item):
-            return self.__getitem__(key).unwrap()
         return self.__getitem__(key)
 
     def __setattr__(self, key: Any, value: Any) -> None:
@@ -224,6 +224,11 @@ class SettingsManager(Singleton):
             ),
         )  # type: ignore
         settings.validators.validate()
+        # Poll intervals
+        validate_duration(self.settings.polling.min_interval, key="polling.min_interval", nonzero=True)
+        validate_duration(self.settings.polling.max_interval, key="polling.max_interval", nonzero=True)
+        if parse(self.settings.polling.min_interval) > parse(self.settings.polling.max_interval):
+            raise ValidationError("polling.min_interval must not be longer than polling.max_interval.")
 
     def read_file(self, filepath: str) -> dict[str, Any]:
         """
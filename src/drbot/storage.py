@@ -1,8 +1,13 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Callable
+import os
 import json
-import re
-import copy
+from json.decoder import WHITESPACE
+import gzip
+import base64
+import binascii
+import hashlib
+from datetime import date
 from prawcore.exceptions import NotFound
 from .log import log
 from .settings import settings
@@ -13,20 +18,63 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .Regi import Regi
 
+# Values of these types can't be changed in place, so a StorageDict holding only these can safely reuse its cached JSON
+IMMUTABLE_TYPES = (str, int, float, bool, type(None), date)
+
 
 class StorageDict(dict[Any, Any]):
     """A magic dictionary that provides persistent storage.
-    You can put anything you want in here so long as it's JSON-serializable, and it will be synced to a wiki page on Reddit."""
+    You can put anything you want in here so long as it's JSON-serializable, and it will be synced to a wiki page on Reddit.
+    The JSON dump is cached between saves and only redone when the dict may have changed.
+    If the dict holds any mutable values (e.g. lists or dicts), it is always redone, since those could have been edited in place through a reference we can't see."""
 
     def __init__(self, *args: Any, store: DataStore, encoder: type[json.JSONEncoder] | None = None, decoder: type[json.JSONDecoder] | None = None, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.__encoder = encoder or DateJSONEncoder
         self.__decoder = decoder or DateJSONDecoder
         self.__store = store
+        self.__dirty = True
+        self.__last_json: str | None = None
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.__dirty = True
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self.__dirty = True
+        super().__delitem__(key)
+
+    def __ior__(self, other: Any) -> StorageDict:
+        self.__dirty = True
+        return super().__ior__(other)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.__dirty = True
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.__dirty = True
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        self.__dirty = True
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[Any, Any]:
+        self.__dirty = True
+        return super().popitem()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self.__dirty = True
+        return super().setdefault(key, default)
 
     def to_json(self) -> str:
-        """Get a JSON dump of the dict."""
-        return json.dumps(self, cls=self.__encoder)
+        """Get a JSON dump of the dict.
+        Reuses the previous dump if nothing has changed since then."""
+        if self.__dirty or self.__last_json is None or not all(isinstance(v, IMMUTABLE_TYPES) for v in super().values()):
+            self.__last_json = json.dumps(self, cls=self.__encoder)
+            self.__dirty = False
+        return self.__last_json
 
     def from_json(self, json_string: str) -> StorageDict:
         """Discard whatever our data currently is and load a JSON string instead."""
@@ -45,12 +93,16 @@ class DataStore:
 
     MAX_PAGE_SIZE = 524288  # Experimentally verified
     _default_meta = {"version": "2.0.0"}
+    PAGE_HEADER = "// This page houses [DrBot](https://github.com/c0d3rman/DRBOT)'s records. **DO NOT EDIT!**"
+    COMPRESSION_HEADER = "// gzip+base64 v1"  # Marks pages whose data is compressed. Pages without it hold plain JSON.
 
     def __init__(self):
         self.WIKI_PAGE: str = settings.storage.wiki_page
         self.DATA_PAGE: str = f"{settings.storage.wiki_page}/{settings.storage.wiki_data_subpage}"
         self.__raws: dict[str, dict[str, str]] = {}
         self.__dicts: dict[str, dict[str, StorageDict]] = {}
+        self.__page_order: dict[str, list[str]] = {}  # The order of kinds and names on the wiki page, so we write them back out in the same order
+        self.__last_written_hash: bytes | None = None  # Hash of the wiki page's contents as of our last read or write
 
         # Load data from the wiki page
         self.__loaded = False
@@ -72,15 +124,22 @@ class DataStore:
             if regi.name in raws:
                 log.debug(f"Loading existing data into the StorageDict for {regi}.")
                 dicts[regi.name].from_json(raws[regi.name])
+                # The StorageDict is now the source of truth, so free the raw data
+                del raws[regi.name]
+                if not raws:
+                    del self.__raws[regi.kind]
         return dicts[regi.name]
 
     def to_json(self) -> str:
         """Dump the DataStore to JSON.
-        The data is stored with two layers of JSON dumping - each StorageDict is made into a JSON string, and then the overall dict of names to stringified StorageDicts is made into a JSON string.
+        Each StorageDict is dumped separately with its own encoder, and the results are spliced directly into the overall JSON object (without being escaped into strings).
         We do it this way to allow each Botling to specify custom JSON encoding/decoding without interfering with the others, and so that we can load the data first and then register Botlings one by one.
         Empty storage dicts are omitted."""
 
-        out = copy.deepcopy(self.__raws)  # Preserve any unparsed raws
+        # Follow the page's order first, so that saving unchanged data produces exactly the page we loaded (and gets skipped)
+        out: dict[str, dict[str, str | None]] = {k: dict.fromkeys(names) for k, names in self.__page_order.items()}
+        for k, d in self.__raws.items():
+            out.setdefault(k, {}).update(d)  # Preserve any unparsed raws
         for k, d in self.__dicts.items():
             if k not in out:
                 out[k] = {}
@@ -90,7 +149,8 @@ class DataStore:
                         del out[k][k2]  # Delete empty parsed raws if present
                     continue
                 out[k][k2] = d2.to_json()
-        return json.dumps(out)
+        # Splice each StorageDict's JSON in directly, rather than dumping it a second time as a string
+        return "{" + ", ".join(f"{json.dumps(k)}: {{" + ", ".join(f"{json.dumps(k2)}: {raw}" for k2, raw in d.items()) + "}" for k, d in out.items()) + "}"
 
     def save(self) -> None:
         """Saves data to the wiki (and stores a local backup)."""
@@ -114,41 +174,115 @@ class DataStore:
                     reason="Automated page for DrBot")
                 reddit.sub.wiki[self.DATA_PAGE].mod.update(listed=True, permlevel=2)  # Make it mod-only
 
-        dump = f"// This page houses [DrBot](https://github.com/c0d3rman/DRBOT)'s records. **DO NOT EDIT!**\n\n{self.to_json()}"
+        # The data is compressed on the wiki to fit more of it in the page and to cut down on bandwidth
+        json_dump = self.to_json()
+        dump = f"{self.PAGE_HEADER}\n{self.COMPRESSION_HEADER}\n\n{self._compress(json_dump)}"
 
         if len(dump) > DataStore.MAX_PAGE_SIZE:
             log.error(f"Data is too long to be written to wiki! ({len(dump)}/{DataStore.MAX_PAGE_SIZE} characters.) Check log for full data.")
-            log.debug(dump)
+            log.debug(json_dump)
             return
 
-        if settings.storage.local_backup_path != "":
-            log.debug(f"Backing up data locally to {settings.storage.local_backup_path}.")
-            with open(settings.storage.local_backup_path, "w") as f:
-                f.write(dump)
-
-        # Don't write if there's no change
-        try:
-            data = reddit.sub.wiki[self.DATA_PAGE].content_md
-        except NotFound:
-            if settings.dry_run:
-                log.info("DRY RUN: because dry-run mode is active, no wiki pages were created, so no data was read from the wiki.")
-            else:
-                e = RuntimeError(f"Somehow, tried to fetch wiki page {self.DATA_PAGE} without it existing. This shouldn't happen.")
-                log.critical(e)
-                raise e
-        if data == dump:
+        # Don't write if there's no change.
+        # We remember a hash of the page as of our last read or write, so we only have to fetch the page if we don't know it.
+        dump_hash = self._hash(dump)
+        if dump_hash == self.__last_written_hash:
             log.debug("Not saving to wiki because it's already identical to what we would have saved.")
             return
+        if self.__last_written_hash is None:
+            data = None
+            try:
+                data = reddit.sub.wiki[self.DATA_PAGE].content_md
+            except NotFound:
+                if settings.dry_run:
+                    log.info("DRY RUN: because dry-run mode is active, no wiki pages were created, so no data was read from the wiki.")
+                else:
+                    e = RuntimeError(f"Somehow, tried to fetch wiki page {self.DATA_PAGE} without it existing. This shouldn't happen.")
+                    log.critical(e)
+                    raise e
+            if data == dump:
+                log.debug("Not saving to wiki because it's already identical to what we would have saved.")
+                self.__last_written_hash = dump_hash
+                return
+
+        # Only back up when something changed, since otherwise the backup is already up to date.
+        # The local backup is kept uncompressed so it's human-readable (DataStore can load either format).
+        # We write to a temporary file and then swap it in, so a crash mid-write can't leave us with a half-written backup.
+        if settings.storage.local_backup_path != "":
+            log.debug(f"Backing up data locally to {settings.storage.local_backup_path}.")
+            tmp_path = settings.storage.local_backup_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(f"{self.PAGE_HEADER}\n\n{json_dump}")
+            os.replace(tmp_path, settings.storage.local_backup_path)
 
         log.info("Saving data to wiki.")
 
         if settings.dry_run:
             log.info("DRY RUN: would have saved some data to the wiki. (See the debug log for the data.)")
-            log.debug(dump)
+            log.debug(json_dump)
         else:
             reddit.sub.wiki[self.DATA_PAGE].edit(
                 content=dump,
                 reason="Automated page for DrBot")
+            self.__last_written_hash = dump_hash
+
+    @staticmethod
+    def _compress(data: str) -> str:
+        """Compress a string into wiki-safe text. mtime is fixed so that identical data always compresses identically."""
+        return base64.b64encode(gzip.compress(data.encode("utf-8"), compresslevel=6, mtime=0)).decode("ascii")
+
+    @staticmethod
+    def _decompress(data: str) -> str:
+        """The inverse of _compress. Whitespace in the input is ignored."""
+        return gzip.decompress(base64.b64decode(data)).decode("utf-8")
+
+    @staticmethod
+    def _split_raws(data: str, start: int = 0) -> dict[str, dict[str, str]]:
+        """Split the page's JSON (starting at `start`) into each StorageDict's raw JSON text, keyed by kind and then name.
+        Each entry is kept as the exact text from the page (rather than being parsed and re-dumped),
+        so a Regi's custom decoder sees the original text and unchanged entries are written back out identically.
+        Older versions of DrBot stored entries as strings inside the JSON, so those are unwrapped into their contents."""
+        decoder = json.JSONDecoder()
+
+        def skip(pos: int) -> int:
+            return WHITESPACE.match(data, pos).end()
+
+        def expect(pos: int, char: str) -> int:
+            if data[pos:pos + 1] != char:
+                raise json.JSONDecodeError(f"Expecting '{char}'", data, pos)
+            return skip(pos + 1)
+
+        def members(pos: int, parse_value: Callable[[int], tuple[Any, int]]) -> tuple[dict[str, Any], int]:
+            """Parse a JSON object starting at pos, using parse_value for its values. Returns the object and the position after it."""
+            out: dict[str, Any] = {}
+            pos = expect(pos, "{")
+            if data[pos:pos + 1] == "}":
+                return out, pos + 1
+            while True:
+                key, pos = decoder.raw_decode(data, pos)
+                if not isinstance(key, str):
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", data, pos)
+                pos = expect(skip(pos), ":")
+                out[key], pos = parse_value(pos)
+                pos = skip(pos)
+                if data[pos:pos + 1] == "}":
+                    return out, pos + 1
+                pos = expect(pos, ",")
+
+        def raw_value(pos: int) -> tuple[str, int]:
+            value, end = decoder.raw_decode(data, pos)  # Parsing validates the entry and tells us where it ends
+            return (value if isinstance(value, str) else data[pos:end]), end
+
+        raws, end = members(skip(start), lambda pos: members(pos, raw_value))
+        end = skip(end)
+        if end != len(data):
+            raise json.JSONDecodeError("Extra data", data, end)
+        return raws
+
+    @staticmethod
+    def _hash(data: str) -> bytes:
+        """Hash the contents of the wiki page, so we can tell whether they changed without keeping a copy around."""
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
 
     def _load(self) -> None:
         """This is an internal method and should not be called.
@@ -175,23 +309,47 @@ class DataStore:
             e = RuntimeError("Wiki pages don't exist even though we checked for them - this shouldn't happen.")
             log.critical(e)
             raise e
+        self.__last_written_hash = self._hash(data)
 
         # TBD: Special process if the page is empty - if something breaks we tell users to delete everything in the page, and we just pretend the page isn't there.
         if data == "":
             data = "{}"
 
-        data = re.sub(r"^//.*?\n", "", data)  # Remove comments
+        # Skip the comment line at the top of the page.
+        # We just track where the data starts rather than slicing, so we don't copy the whole page.
+        start = 0
+        if data.startswith("//"):
+            newline = data.find("\n")
+            start = newline + 1 if newline != -1 else len(data)
+
+        # Decompress the data if it's compressed
+        if data.startswith(self.COMPRESSION_HEADER, start):
+            try:
+                data = self._decompress(data[start + len(self.COMPRESSION_HEADER):])
+                start = 0
+            except (binascii.Error, OSError, EOFError, UnicodeDecodeError) as e:
+                log.critical(f"Could not decompress data from the wiki! If you have a local backup, you can restore it by pasting it into {self.DATA_PAGE}. If not, delete everything from the page and rerun DrBot (but this will lose all of your data). See the log for more information. Error:\n{e}")
+                log.debug(f"Problematic data:\n\n{data}")
+                raise e
+
+        # Each StorageDict's data stays as a JSON string until its Regi is registered and tells us how to decode it
         try:
-            self.__raws = json.loads(data)
+            self.__raws = self._split_raws(data, start)
         except json.JSONDecodeError as e:
             log.critical(f"Could not decode JSON data from the wiki! If you can, manually fix the JSON issue in {self.DATA_PAGE}. If not, delete everything from the page and rerun DrBot (but this will lose all of your data). See the log for more information. Error:\n{e}")
             log.debug(f"Problematic data:\n\n{data}")
             raise e
+        del data  # The page can be large, so don't keep it around alongside the split-up version
+        self.__page_order = {k: list(d) for k, d in self.__raws.items()}
+
+        # Summarize rather than dumping everything, which would mean holding a second full copy of the data just for the log
+        log.debug("Data loaded:" + "".join(f"\n- {kind}: " + ", ".join(f"{name} ({len(raw)} characters)" for name, raw in raws.items()) for kind, raws in self.__raws.items()))
 
         # Load everything in _meta immediately
         if "_meta" in self.__raws:
             try:
                 self.__dicts["_meta"] = {k: StorageDict(store=self).from_json(d) for k, d in self.__raws["_meta"].items()}
+                del self.__raws["_meta"]  # The StorageDicts are now the source of truth
                 log.debug("Loaded DataStore metadata from wiki.")
             except Exception as e:
                 log.critical(f"Could not decode _meta data from the wiki! If you can, manually fix the JSON issue in {self.DATA_PAGE}. If not, delete the _meta data from the page and rerun DrBot (but this will lose any data in _meta). See the log for more information. Error:\n{e}")
@@ -200,5 +358,3 @@ class DataStore:
         # Or create _meta if required
         else:
             self.__dicts["_meta"] = {"DrBot": StorageDict(self._default_meta, store=self)}
-
-        log.debug(f"Data loaded:\n{self.to_json()}")
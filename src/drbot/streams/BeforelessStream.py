@@ -17,13 +17,17 @@ class BeforelessStream(Stream[T]):
         # Since there's no before parameter, so we keep a persistent stream
         # and scroll it forward ourselves at initialization.
         self._stream = self.get_raw_stream()
+        last_processed = self.DR.storage["last_processed"]
+        if not last_processed:
+            # If we haven't processed anything yet, all items are new and there's nothing to scroll past.
+            return
         for item in self._stream:
             if item is None:
                 # If the latest doesn't appear anywhere in the stream, it's too old,
                 # so we reset the stream so all items are included.
                 self._stream = self.get_raw_stream()
                 break
-            if self.id(item) == self.DR.storage["last_processed"]:
+            if self.id(item) == last_processed:
                 # If we find the latest item, we've scrolled far enough -
                 # the next time the stream is used it will spit out a not-yet-seen item.
                 break
@@ -18,7 +18,11 @@ class CommentStream(Stream[Comment]):
             yield item
 
     def id(self, item: Comment) -> str:
-        return item.fullname
+        # PRAW rebuilds the fullname on every access, so we cache it on the item itself
+        fullname = item.__dict__.get("_drbot_id")
+        if fullname is None:
+            fullname = item.__dict__["_drbot_id"] = item.fullname
+        return fullname
 
     def get_latest_item(self) -> Comment | None:
         return next(reddit.sub.comments(limit=1), None)
@@ -18,7 +18,11 @@ class EditedStream(Stream[Submission | Comment]):
             yield item
 
     def id(self, item: Submission | Comment) -> str:
-        return item.fullname
+        # PRAW rebuilds the fullname on every access, so we cache it on the item itself
+        fullname = item.__dict__.get("_drbot_id")
+        if fullname is None:
+            fullname = item.__dict__["_drbot_id"] = item.fullname
+        return fullname
 
     def get_latest_item(self) -> Submission | Comment | None:
         return next(reddit.sub.mod.edited(limit=1), None)
@@ -12,6 +12,10 @@ class ModlogStream(Stream[ModAction]):
     """A stream of modlog entries.
     Does not include modlog entries related to DrBot, otherwise we'd end up in infinite loops every time we did something."""
 
+    def setup(self) -> None:
+        # Look up our own username once, rather than for every modlog entry
+        self._me_name = reddit.user.me().name
+
     def get_items(self) -> Iterable[ModAction]:
         for item in reddit.sub.mod.stream.log(continue_after_id=self.DR.storage["last_processed"], pause_after=0):
             if item is None:
@@ -27,4 +31,4 @@ class ModlogStream(Stream[ModAction]):
     def skip_item(self, item: ModAction) -> bool:
         # Very important: skip any items created by DrBot, otherwise we would end up in an infinite loop,
         # since every time we save last_processed it would create a modlog entry.
-        return item._mod == reddit.user.me().name
+        return item._mod == self._me_name
@@ -18,29 +18,51 @@ class ModmailMessageStream(TimeGuardedStream[ModmailMessage]):
         super().__init__(name=name or f"{self.__class__.__name__}[{state}]")
         self.state = state  # Must happen here since get_latest_item is called before setup
 
+    # Heap entries are sorted by a single packed int rather than a tuple, since ints compare much faster.
+    # From most to least significant: negated timestamp in microseconds, conversation index, inverted message index.
+    # This keeps the order reddit gives us for ties - first (newest) conversations first, last (newest) messages first.
+    _CONVERSATION_BITS = 32
+    _MESSAGE_BITS = 20
+
     def get_items_raw(self) -> Iterable[ModmailMessage]:
-        heap = []
-        heapq.heapify(heap)
+        # This is a lazy k-way merge of each conversation's messages.
+        # We can't use heapq.merge, since it needs every conversation up front and would make PRAW fetch all of modmail.
+        heap: list[tuple[int, ModmailMessage]] = []
+        message_mask = (1 << self._MESSAGE_BITS) - 1
+        timestamp_shift = self._CONVERSATION_BITS + self._MESSAGE_BITS
+
+        for conversation_i, conversation in enumerate(reddit.sub.modmail.conversations(state=self.state, limit=None, sort="recent"), start=1):
+            assert conversation_i < 1 << self._CONVERSATION_BITS and len(conversation.messages) <= message_mask, "Too much modmail to sort."
 
-        conversation_i = 0
-        for conversation in reddit.sub.modmail.conversations(state=self.state, limit=None, sort="recent"):
-            message_i = 0
-            conversation_i += 1
+            # Compute each message's timestamp only once
+            timestamps = [-round(self.timestamp(message).timestamp() * 1_000_000) for message in conversation.messages]
 
             # Pop from the heap until the next conversation's latest message is newer than anything we've seen
-            while len(heap) > 0 and -self.timestamp(conversation.messages[-1]).timestamp() >= heap[0][0]:
-                yield heapq.heappop(heap)[3]
+            latest = timestamps[-1]
+            while len(heap) > 0 and latest >= heap[0][0] >> timestamp_shift:
+                yield heapq.heappop(heap)[1]
 
             # Ingest all messages into the heap
-            for message in conversation.messages:
-                message_i += 1
-                heapq.heappush(heap, (-self.timestamp(message).timestamp(), conversation_i, -message_i, message))  # Make sure that we tiebreak timestamps and maintain the order reddit gives us - first (newest) conversations first, last (newest) messages first
+            conversation_key = conversation_i << self._MESSAGE_BITS
+            for message_i, (timestamp, message) in enumerate(zip(timestamps, conversation.messages), start=1):
+                heapq.heappush(heap, ((timestamp << timestamp_shift) | conversation_key | (message_mask - message_i), message))
+
+        # Once we run out of conversations, everything left in the heap is in order
+        while len(heap) > 0:
+            yield heapq.heappop(heap)[1]
 
     def id(self, item: ModmailMessage) -> str:
         return item.id
 
     def timestamp(self, item: ModmailMessage) -> datetime:
-        return datetime.fromisoformat(item.date).astimezone(timezone.utc)
+        # This gets called several times per message each poll, so we cache the parsed timestamp on the message itself
+        timestamp = item.__dict__.get("_drbot_timestamp")
+        if timestamp is None:
+            timestamp = datetime.fromisoformat(item.date)
+            if timestamp.tzinfo is not timezone.utc:  # Reddit's dates are already in UTC, so we can usually skip converting
+                timestamp = timestamp.astimezone(timezone.utc)
+            item.__dict__["_drbot_timestamp"] = timestamp
+        return timestamp
 
     def get_latest_item(self) -> ModmailMessage | None:
         latest_conversation = next(reddit.sub.modmail.conversations(state=self.state, limit=1, sort="recent"), None)
@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from typing import Iterable
 
+_UTC = timezone.utc  # Bound once to save an attribute lookup per post
+
 
 class PostStream(TimeGuardedStream[Submission]):
     """A stream of posts."""
@@ -19,7 +21,10 @@ class PostStream(TimeGuardedStream[Submission]):
         return item.id
 
     def timestamp(self, item: Submission) -> datetime:
-        return datetime.fromtimestamp(item.created_utc, timezone.utc)
+        return datetime.fromtimestamp(item.created_utc, _UTC)
+
+    def timestamp_raw(self, item: Submission) -> float:
+        return item.created_utc
 
     def get_latest_item(self) -> Submission | None:
         return next(reddit.sub.new(limit=1), None)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 from abc import abstractmethod
-from typing import TypeVar
+from typing import Any, TypeVar
+from collections import deque
 from ..log import log
 from ..Stream import Stream
+from ..util import DuplicateFilter
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -14,34 +16,57 @@ T = TypeVar("T")
 
 class TimeGuardedStream(Stream[T]):
     """A stream for a Reddit endpoint that doesn't have a functioning `before` parameter.
-    Instead, we keep track of a timestamp for each item and sweep the list ourselves."""
+    Instead, we keep track of a timestamp for each item and sweep the list ourselves.
+    We also remember the IDs of the most recent items, since items that share a timestamp with the last processed one would otherwise be processed again."""
+
+    SEEN_IDS_SIZE = 100  # How many of the most recent item IDs to remember
+
+    def initialize_storage(self, latest: T | None) -> None:
+        # Initialize last_processed_time from the same item so we don't have to fetch it again in setup()
+        super().initialize_storage(latest)
+        self.__initialize_last_processed_time(latest)
+
+    def __initialize_last_processed_time(self, latest: T | None) -> None:
+        self.DR.storage["last_processed_time"] = self.timestamp(latest) if latest else None
+        log.debug(f"Initialized last_processed_time for {self} - {self.DR.storage['last_processed_time']}")
 
     def setup(self) -> None:
-        if "last_processed_time" not in self.DR.storage:
-            latest = self.get_latest_item()
-            self.DR.storage["last_processed_time"] = self.timestamp(latest) if latest else None
-            log.debug(f"Initialized last_processed_time for {self} - {self.DR.storage['last_processed_time']}")
+        if "last_processed_time" not in self.DR.storage:  # Only needed if last_processed was somehow initialized without it
+            self.__initialize_last_processed_time(self.get_latest_item())
+
+        self._seen_ids: DuplicateFilter[Any] = DuplicateFilter(self.SEEN_IDS_SIZE, self.DR.storage.get("seen_ids", []))
 
     def get_items(self) -> Iterable[T]:
-        items: list[T] = []
-        last_processed_time: datetime | None = None
+        items: deque[T] = deque()  # We get items from latest to earliest, so we build this back-to-front to end up with earliest to latest
+        # These don't change during the loop, so look them up only once
+        stored_last_processed = self.DR.storage["last_processed"]
+        stored_last_processed_time = self.DR.storage["last_processed_time"]
+        # Compare raw epoch seconds so we don't have to build a datetime for every item
+        stored_last_processed_raw = stored_last_processed_time.timestamp() if stored_last_processed_time else None
+        get_id = self.id
+        get_timestamp_raw = self.timestamp_raw
+        seen_ids = self._seen_ids
+        # We break as soon as we hit something old, so PRAW never fetches more listing pages than it needs to
         for item in self.get_items_raw():
+            item_id = get_id(item)
             # Stop early if we see the last processed ID - this check is repeated in Stream.run() but we want to quit early here if we can to save time
-            if self.id(item) == self.DR.storage["last_processed"]:
+            if item_id == stored_last_processed:
                 break
-            d = self.timestamp(item)
             # If we're before our last processed time, stop regardless of whether we've seen the last_processed id (which is the whole point of TimeGuardedStream)
-            if self.DR.storage["last_processed_time"] and d < self.DR.storage["last_processed_time"]:
+            if stored_last_processed_raw is not None and get_timestamp_raw(item) < stored_last_processed_raw:
                 break
-            # We get items from latest to earliest, so only the first item's last_processed_time should be kept
-            if not last_processed_time:
-                last_processed_time = d
-            items.append(item)
-        # If we processed at least one thing, update the last processed time
-        if last_processed_time:
-            self.DR.storage["last_processed_time"] = last_processed_time
+            # Skip items we've already seen.
+            # Everything we've seen is at or before last_processed_time, so this only catches items sharing that timestamp - older ones already stopped us above.
+            if item_id in seen_ids:
+                continue
+            items.appendleft(item)
+        # If we processed at least one thing, update the last processed time and the seen IDs
+        if items:
+            self.DR.storage["last_processed_time"] = self.timestamp(items[-1])  # The latest item ends up at the back
+            seen_ids.add_batch(get_id(item) for item in items)
+            self.DR.storage["seen_ids"] = list(seen_ids)
         # Return items to be processed from earliest to latest
-        return reversed(items)
+        return items
 
     @abstractmethod
     def get_items_raw(self) -> Iterable[T]:
@@ -53,3 +78,8 @@ class TimeGuardedStream(Stream[T]):
     def timestamp(self, item: T) -> datetime:
         """Given an item, return the timestamp associated with it."""
         pass
+
+    def timestamp_raw(self, item: T) -> float:
+        """Given an item, return its timestamp as seconds since the epoch.
+        This is what get_items compares against, so override it if your items have a raw timestamp you can return more cheaply than timestamp()."""
+        return self.timestamp(item).timestamp()
@@ -1,13 +1,14 @@
 from __future__ import annotations
 from abc import abstractmethod
 from typing import TypeVar
+from collections import deque
+from functools import partial
 from datetime import datetime
 from praw.models import ModmailConversation, ModmailMessage
 from ..Stream import Stream
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from typing import Callable
     from ..DrBot import DrBotRep
 
 T = TypeVar("T")
@@ -16,10 +17,12 @@ T = TypeVar("T")
 class SubStream(Stream[T]):
     """A SubStream that filters for only some items from a parent Stream."""
 
+    __slots__ = ("__parent", "__items")
+
     def __init__(self, parent: Stream[T], name: str | None = None) -> None:
         super().__init__(name or f"{self.__class__.__name__}[{parent.name}]")
         self.__parent = parent
-        self.__items: list[T] = []
+        self.__items: deque[T] = deque()
 
     def setup(self) -> None:
         self.parent.subscribe(self, self._handle)
@@ -34,8 +37,8 @@ class SubStream(Stream[T]):
 
     def get_items(self) -> list[T]:
         items = self.__items
-        self.__items = []
-        return items
+        self.__items = deque()
+        return list(items)
 
     def id(self, item: T) -> T:
         return self.__parent.id(item)
@@ -57,40 +60,52 @@ class UnionStream(Stream[T]):
     Uses the ID of each respective parent Stream for its items,
     so if your ID functions are inconsistent but your streams share items you may reprocess some things."""
 
+    __slots__ = ("__streams", "__items", "__owners", "__ids")
+
     def __init__(self, *streams: Stream[T], name: str | None = None) -> None:
         super().__init__(name or self.__class__.__name__ + "[" + ",".join(s.name for s in streams) + "]")
         assert len(streams) > 0, f"You must provide at least one stream to UnionStream."
         self.__streams = streams
-        self.__items: list[T] = []
-        self.__ids: dict[Stream[T], set[int]] = {stream: set() for stream in streams}
+        self.__items: deque[T] = deque()
+        self.__owners: dict[int, Stream[T]] = {}  # Maps each item's numerical python ID to the parent stream it came from
+        self.__ids: dict[Stream[T], set[int]] = {stream: set() for stream in streams}  # The IDs each parent stream has claimed, so we can clear out a stream's entries quickly
 
     def setup(self) -> None:
         for stream in self.streams:
-            stream.subscribe(self, self._make_handler(stream), self._make_start_run(stream))
+            stream.subscribe(self, partial(self._handle, stream), partial(self._start_run, stream))
 
     @property
     def streams(self):
         """The Streams which this UnionStream draws from."""
         return self.__streams
 
-    def _make_handler(self, stream: Stream[T]) -> Callable[[T], None]:
-        """Make a handler for a given parent stream."""
-        def _handle(item: T) -> None:
-            self.__items.append(item)
-            self.__ids[stream].add(id(item))  # Save this item's numerical python ID so we can find its parent later
-        return _handle
-
-    def _make_start_run(self, stream: Stream[T]) -> Callable[[], None]:
-        """Make a start_run function for a given parent stream."""
-        def _start_run() -> None:
-            # Clear the respective stream's ID dict,
-            # since otherwise it will build up indefinitely and run us out of memory over time
-            self.__ids[stream].clear()
-        return _start_run
+    def _handle(self, stream: Stream[T], item: T) -> None:
+        """Handle an item from a given parent stream."""
+        self.__items.append(item)
+        # Save this item's numerical python ID so we can find its parent later
+        owner = self.__owners.get(id(item))
+        if owner is None or self.__streams.index(stream) < self.__streams.index(owner):  # Favor earlier parents in ties
+            self.__owners[id(item)] = stream
+        self.__ids[stream].add(id(item))
+
+    def _start_run(self, stream: Stream[T]) -> None:
+        """Handle the start of a new run from a given parent stream."""
+        # Clear the respective stream's IDs,
+        # since otherwise they will build up indefinitely and run us out of memory over time
+        ids = self.__ids[stream]
+        self.__ids[stream] = set()
+        for item_id in ids:
+            if self.__owners.get(item_id) is stream:
+                # Hand the ID over to the earliest other parent that still claims it, if any
+                owner = next((s for s in self.__streams if item_id in self.__ids[s]), None)
+                if owner is None:
+                    del self.__owners[item_id]
+                else:
+                    self.__owners[item_id] = owner
 
     def get_items(self) -> list[T]:
-        items = self.sort_items(self.__items)
-        self.__items = []
+        items = self.sort_items(list(self.__items))
+        self.__items = deque()
         return items
 
     def id(self, item: T) -> T:
@@ -99,10 +114,7 @@ class UnionStream(Stream[T]):
         and only while it's still in memory.
         Failing that, we default to the first parent stream's ID function.
         If all of your streams have the same ID function, this isn't a concern."""
-        for stream, ids in self.__ids.items():  # If we can find it, use the relevant parent's ID function
-            if id(item) in ids:
-                return stream.id(item)  # This will favor earlier parents in ties
-        return self.__streams[0].id(item)
+        return self.__owners.get(id(item), self.__streams[0]).id(item)  # If we can find it, use the relevant parent's ID function
 
     def accept_registration(self, DR: DrBotRep) -> None:
         # Make sure all parents are registered first, otherwise we'll output their items one polling cycle late
@@ -118,10 +130,16 @@ class UnionStream(Stream[T]):
 
 
 class ModmailConversationUnionStream(UnionStream[ModmailConversation]):
+    __slots__ = ()
+
     def sort_items(self, items: list[ModmailConversation]) -> list[ModmailConversation]:
-        return list(sorted(items, key=lambda item: datetime.fromisoformat(item.messages[-1].date)))
+        items.sort(key=lambda item: datetime.fromisoformat(item.messages[-1].date))  # The key is computed once per item
+        return items
 
 
 class ModmailMessageUnionStream(UnionStream[ModmailMessage]):
+    __slots__ = ()
+
     def sort_items(self, items: list[ModmailMessage]) -> list[ModmailMessage]:
-        return list(sorted(items, key=lambda item: datetime.fromisoformat(item.date)))
+        items.sort(key=lambda item: datetime.fromisoformat(item.date))
+        return items
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Any, TypeVar, Callable
+from typing import Any, TypeVar, Callable, Generic, Iterable, Iterator
 import json
 import datetime
 import re
+import time
+from collections import Counter, deque
 import schedule
 from pytimeparse import parse
 
@@ -16,15 +18,28 @@ class DateJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def _date_object_hook(d: dict[str, Any]) -> Any:
+    if "$date" in d:
+        return datetime.datetime.fromisoformat(d["$date"])
+    return d
+
+
+_PLAIN_DECODER = json.JSONDecoder()
+
+
 class DateJSONDecoder(json.JSONDecoder):
     """Default decoder used to make sure we can read datetimes from JSON."""
 
     def __init__(self, *args: Any, **kwargs: Any):
-        def object_hook(d: dict[str, Any]) -> Any:
-            if "$date" in d:
-                return datetime.datetime.fromisoformat(d["$date"])
-            return d
-        super().__init__(object_hook=object_hook, *args, **kwargs)
+        # json.loads makes a new decoder every call, so keep construction cheap
+        super().__init__(object_hook=_date_object_hook, *args, **kwargs)
+        self.__plain_decoder = json.JSONDecoder(*args, **kwargs) if args or kwargs else _PLAIN_DECODER
+
+    def decode(self, s: str, *args: Any, **kwargs: Any) -> Any:
+        # If there are no dates in the JSON, skip calling object_hook on every object and let the parser run at full speed
+        if "$date" not in s:
+            return self.__plain_decoder.decode(s, *args, **kwargs)
+        return super().decode(s, *args, **kwargs)
 
 
 class Singleton:
@@ -48,27 +63,102 @@ class Singleton:
         self._initialized = True
 
 
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in r"\_*[]()~`>#+-=|{}.!"})
+
+
 def escape_markdown(text: str | None):
     """Helper to escape markdown, since apparently no one but python-telegram-bot has standardized one of these and I'm not making that a dependency."""
 
     if text is None:
         return None
-    escape_chars = r"\_*[]()~`>#+-=|{}.!"
-    return re.sub(f"([{re.escape(escape_chars)}])", r"\\\1", text)
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
 
 
 T = TypeVar("T")
 
 
-def get_dupes(L: list[T]) -> set[T]:
+def get_dupes(L: Iterable[T]) -> set[T]:
     """
-    Given a list, get a set of all elements which appear more than once.
+    Given a list (or any iterable), get a set of all elements which appear more than once.
+    The input is only iterated once, so generators are fine.
     """
-    seen: set[T] = set()
-    seen2: set[T] = set()
-    for item in L:
-        seen2.add(item) if item in seen else seen.add(item)
-    return seen2
+    return {item for item, count in Counter(L).items() if count > 1}
+
+
+class DuplicateFilter(Generic[T]):
+    """Remembers the most recent items it has been given, so you can check whether you've seen something before
+    without rebuilding a set every time.
+    Once it's full, the oldest items are forgotten first."""
+
+    def __init__(self, maxlen: int, items: Iterable[T] = ()) -> None:
+        if maxlen < 1:
+            raise ValueError(f"DuplicateFilter's maxlen must be at least 1, not {maxlen}.")
+        # The deque keeps the order (so we know what to forget), and the set makes lookups fast
+        self.__order: deque[T] = deque(maxlen=maxlen)
+        self.__seen: set[T] = set()
+        self.add_batch(items)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.__seen
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate from oldest to newest. Useful for saving the filter, e.g. `list(duplicate_filter)`."""
+        return iter(self.__order)
+
+    def __len__(self) -> int:
+        return len(self.__order)
+
+    def add(self, item: T) -> bool:
+        """Remember an item. Returns True if we had already seen it."""
+        if item in self.__seen:
+            return True
+        if len(self.__order) == self.__order.maxlen:
+            self.__seen.discard(self.__order[0])  # This one is about to fall off the end of the deque
+        self.__order.append(item)
+        self.__seen.add(item)
+        return False
+
+    def add_batch(self, items: Iterable[T]) -> set[T]:
+        """Remember a batch of items. Returns the set of ones we had already seen."""
+        add = self.add
+        return {item for item in items if add(item)}
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """A small cache whose entries expire a fixed number of seconds after they're set.
+    Once it holds maxsize entries, the oldest ones are dropped to make room."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.__entries: dict[K, tuple[float, V]] = {}  # key -> (expiry time, value), oldest first
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get a value, or the default if it's missing or expired."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self.__entries[key]
+            return default
+        return entry[1]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.__entries.pop(key, None)  # Re-insert so the key counts as the newest
+        while len(self.__entries) >= self.maxsize:
+            del self.__entries[next(iter(self.__entries))]
+        self.__entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+
+_MARKDOWN_COMMENT_RE = re.compile(r"\[//DrBot\]: # \((.*)\)")
+_ESCAPED_NEWLINE_RE = re.compile(r"(?<!\\)\\n")
 
 
 def markdown_comment(comment: str) -> str:
@@ -76,14 +166,14 @@ def markdown_comment(comment: str) -> str:
     This comment must be on its own line with nothing before or after it.
     It's recommended to insert a blank line before and after the comment to separate it from any other lines."""
     comment = comment.replace("\\n", "\\\\n").replace("\n", "\\n")  # Escape newlines
-    return f"[//DrBot]: # (" + comment.replace("\\n", "\\\\n").replace("\n", "\\n") + ")"
+    return f"[//DrBot]: # ({comment})"
 
 
 def get_markdown_comments(md: str) -> list[str]:
     """Get all DrBot-style markdown comments from a markdown string.
     Returns an empty list if there are none."""
-    comments = re.findall(r"\[//DrBot\]: # \((.*)\)", md)
-    return [re.sub(r"(?<!\\)\\n", "\n", s.replace("\\\\n", "\\n")) for s in comments]  # Unescape newlines
+    comments = _MARKDOWN_COMMENT_RE.findall(md)
+    return [_ESCAPED_NEWLINE_RE.sub("\n", s.replace("\\\\n", "\\n")) for s in comments]  # Unescape newlines
 
 
 def do_once(function: Callable[..., Any]) -> Callable[..., Any]: